@@ -1,6 +1,7 @@
 import os
 import sys
 import struct
+import collections
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk, ImageOps
@@ -10,104 +11,174 @@ import subprocess
 import math
 import io
 import traceback
+import hashlib
+import re
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 try:
     from tkinterdnd2 import DND_FILES, TkinterDnD
     DND_AVAILABLE = True
 except Exception:
     DND_AVAILABLE = False
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None
+
+def _user_cache_dir(app="timview"):
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif platform.system() == "Darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, app)
+
+_THUMB_CACHE_DIR = os.path.join(_user_cache_dir(), "thumbs")
+
+# tkdnd drop payload: brace-quoted paths (may contain spaces) or bare tokens
+_DND_RE = re.compile(r'\{([^}]*)\}|(\S+)')
 
 # ---------- TIM read / write functions ----------
+# Default grayscale palette for CLUT-less 4bpp files. 0x421 spreads the
+# 5-bit value into all three BGR555 channels (1 | 1<<5 | 1<<10 == 0x421).
+# CLUT-less 8bpp skips the palette entirely and broadcasts the intensity
+# in read_tim.
+_DEFAULT_PAL4 = (np.arange(16, dtype=np.uint16) & 0x1F) * 0x421
+
+# Block header layout shared by the CLUT and image sections: a uint32 byte
+# count followed by x/y origin and width/height in 16-bit words.
+_TIM_BLOCK_HDR = np.dtype([('size', '<u4'), ('x', '<u2'), ('y', '<u2'),
+                           ('w', '<u2'), ('h', '<u2')])
+
+# RGB555 -> RGB888 lookup table: one gather per pixel instead of six
+# shift/mask ops. 192KB, built once at import and hot across decodes.
+_ci = np.arange(65536, dtype=np.uint16)
+_RGB555_LUT = np.empty((65536, 3), dtype=np.uint8)
+_RGB555_LUT[:, 0] = (_ci & 0x1F) << 3
+_RGB555_LUT[:, 1] = ((_ci >> 5) & 0x1F) << 3
+_RGB555_LUT[:, 2] = ((_ci >> 10) & 0x1F) << 3
+del _ci
+
+if njit is not None:
+    # Fused decode kernels for users with numba installed: nibble unpack,
+    # CLUT gather and RGB expansion in one pass over the input bytes, with
+    # no intermediate uint16 color_vals array.
+    @njit(parallel=True, cache=True)
+    def _decode_4bpp_clut_nb(packed, rgb_palette, w, h, out):
+        for row in prange(h):
+            row_off = row * w
+            for col in range(w):
+                i = row_off + col
+                byte = packed[i >> 1]
+                if (i & 1) == 0:
+                    idx = byte & 0x0F
+                else:
+                    idx = (byte >> 4) & 0x0F
+                out[row, col, 0] = rgb_palette[idx, 0]
+                out[row, col, 1] = rgb_palette[idx, 1]
+                out[row, col, 2] = rgb_palette[idx, 2]
+
+    @njit(parallel=True, cache=True)
+    def _decode_8bpp_clut_nb(pixels, rgb_palette, w, h, out):
+        for row in prange(h):
+            row_off = row * w
+            for col in range(w):
+                idx = pixels[row_off + col]
+                out[row, col, 0] = rgb_palette[idx, 0]
+                out[row, col, 1] = rgb_palette[idx, 1]
+                out[row, col, 2] = rgb_palette[idx, 2]
+
+
 def read_tim(filepath, palette_index=0):
     """
     Return a PIL.Image for the TIM file at filepath.
     Supports 4bpp (CLUT), 8bpp (CLUT), 16bpp, 24bpp.
     """
     with open(filepath, 'rb') as f:
-        magic = struct.unpack("<I", f.read(4))[0]
-        if magic != 0x10:
-            raise ValueError("Not a TIM file (bad magic)")
-
-        flags = struct.unpack("<I", f.read(4))[0]
-        has_clut = bool(flags & 0x08)
-        bpp_mode = flags & 0x07
-        bpp = {0: 4, 1: 8, 2: 16, 3: 24}.get(bpp_mode, None)
-        if bpp is None:
-            raise ValueError(f"Unsupported BPP mode: {bpp_mode}")
-
-        clut = None
-        selected_palette = None
-        if has_clut:
-            clut_block_size = struct.unpack("<I", f.read(4))[0]
-            clut_x, clut_y, clut_w, clut_h = struct.unpack("<4H", f.read(8))
-            clut_data = f.read(clut_block_size - 12)
-            clut_colors = np.frombuffer(clut_data, dtype=np.uint16)
-            try:
-                clut = clut_colors.reshape((-1, clut_w))
-            except Exception:
-                clut = clut_colors.reshape((1, -1))
-            if palette_index >= len(clut):
-                palette_index = 0
-            selected_palette = clut[palette_index]
-        else:
-            selected_palette = None
-
-        img_block_size = struct.unpack("<I", f.read(4))[0]
-        x, y, w_words, h = struct.unpack("<4H", f.read(8))
-
-        if bpp == 4:
-            w = w_words * 4
-        elif bpp == 8:
-            w = w_words * 2
-        else:
-            w = w_words
-
-        raw_data = f.read()
-
-        if bpp == 4:
-            num_pixels = w * h
-            bytes_needed = (num_pixels + 1) // 2
-            pixels = np.frombuffer(raw_data[:bytes_needed], dtype=np.uint8)
-            pixels_unpack = np.zeros(num_pixels, dtype=np.uint8)
-            for i in range(num_pixels):
-                byte = pixels[i // 2]
-                if (i & 1) == 0:
-                    pixels_unpack[i] = byte & 0x0F
-                else:
-                    pixels_unpack[i] = (byte >> 4) & 0x0F
-            pixels = pixels_unpack.reshape((h, w))
-            if selected_palette is None:
-                color_vals = np.array([(i & 0x1F) | ((i & 0x1F) << 5) | ((i & 0x1F) << 10) for i in range(16)], dtype=np.uint16)
-                color_vals = color_vals[pixels]
-            else:
-                color_vals = selected_palette[pixels]
+        data = f.read()
+
+    magic, flags = (int(v) for v in np.frombuffer(data, dtype='<u4', count=2))
+    if magic != 0x10:
+        raise ValueError("Not a TIM file (bad magic)")
+
+    has_clut = bool(flags & 0x08)
+    bpp_mode = flags & 0x07
+    bpp = {0: 4, 1: 8, 2: 16, 3: 24}.get(bpp_mode, None)
+    if bpp is None:
+        raise ValueError(f"Unsupported BPP mode: {bpp_mode}")
+
+    off = 8
+    selected_palette = None
+    if has_clut:
+        clut_hdr = np.frombuffer(data, dtype=_TIM_BLOCK_HDR, count=1, offset=off)[0]
+        clut_block_size = int(clut_hdr['size'])
+        clut_w, clut_h = int(clut_hdr['w']), int(clut_hdr['h'])
+        clut_colors = np.frombuffer(data, dtype=np.uint16,
+                                    count=(clut_block_size - 12) // 2, offset=off + 12)
+        try:
+            clut = clut_colors.reshape((-1, clut_w))
+        except Exception:
+            clut = clut_colors.reshape((1, -1))
+        if palette_index >= len(clut):
+            palette_index = 0
+        selected_palette = clut[palette_index]
+        off += clut_block_size
 
-        elif bpp == 8:
-            pixels = np.frombuffer(raw_data[:w * h], dtype=np.uint8).reshape((h, w))
-            if selected_palette is None:
-                selected_palette = np.array([(i & 0x1F) | ((i & 0x1F) << 5) | ((i & 0x1F) << 10) for i in range(256)], dtype=np.uint16)
-            color_vals = selected_palette[pixels]
+    img_hdr = np.frombuffer(data, dtype=_TIM_BLOCK_HDR, count=1, offset=off)[0]
+    w_words, h = int(img_hdr['w']), int(img_hdr['h'])
+    pix_off = off + 12
 
-        elif bpp == 16:
-            img_array = np.frombuffer(raw_data[:w * h * 2], dtype=np.uint16).reshape((h, w))
-            r = (img_array & 0x1F) << 3
-            g = ((img_array >> 5) & 0x1F) << 3
-            b = ((img_array >> 10) & 0x1F) << 3
-            rgb = np.stack([r, g, b], axis=2).astype(np.uint8)
-            return Image.fromarray(rgb, mode="RGB")
+    if bpp == 4:
+        w = w_words * 4
+    elif bpp == 8:
+        w = w_words * 2
+    else:
+        w = w_words
 
-        elif bpp == 24:
-            return Image.frombytes("RGB", (w, h), raw_data[:w * h * 3], "raw", "RGB")
+    if bpp == 4:
+        num_pixels = w * h
+        bytes_needed = (num_pixels + 1) // 2
+        packed = np.frombuffer(data, dtype=np.uint8, count=bytes_needed, offset=pix_off)
+        if selected_palette is None:
+            selected_palette = _DEFAULT_PAL4
+        # The kernels run without bounds checking, so a short CLUT row must
+        # take the NumPy path, where the gather raises IndexError instead
+        # of reading out of bounds.
+        if njit is not None and len(selected_palette) >= 16:
+            out = np.empty((h, w, 3), dtype=np.uint8)
+            _decode_4bpp_clut_nb(packed, _RGB555_LUT[selected_palette], w, h, out)
+            return Image.fromarray(out, mode="RGB")
+        unpacked = np.empty(packed.size * 2, dtype=np.uint8)
+        unpacked[0::2] = packed & 0x0F
+        unpacked[1::2] = packed >> 4
+        pixels = unpacked[:num_pixels].reshape((h, w))
+        color_vals = selected_palette[pixels]
+
+    elif bpp == 8:
+        pixels = np.frombuffer(data, dtype=np.uint8, count=w * h, offset=pix_off).reshape((h, w))
+        if selected_palette is None:
+            # The default palette is grayscale, so broadcast the intensity
+            # directly instead of gathering through a 256-entry lookup.
+            v = ((pixels & 0x1F) << 3).astype(np.uint8)
+            return Image.fromarray(np.stack([v, v, v], axis=2), mode="RGB")
+        if njit is not None and len(selected_palette) >= 256:
+            out = np.empty((h, w, 3), dtype=np.uint8)
+            _decode_8bpp_clut_nb(pixels.ravel(), _RGB555_LUT[selected_palette], w, h, out)
+            return Image.fromarray(out, mode="RGB")
+        color_vals = selected_palette[pixels]
+
+    elif bpp == 16:
+        img_array = np.frombuffer(data, dtype=np.uint16, count=w * h, offset=pix_off).reshape((h, w))
+        return Image.fromarray(_RGB555_LUT[img_array], mode="RGB")
+
+    elif bpp == 24:
+        return Image.frombytes("RGB", (w, h), data[pix_off:pix_off + w * h * 3], "raw", "RGB")
 
-        else:
-            raise NotImplementedError("Unsupported BPP")
+    else:
+        raise NotImplementedError("Unsupported BPP")
 
-        r = (color_vals & 0x1F) << 3
-        g = ((color_vals >> 5) & 0x1F) << 3
-        b = ((color_vals >> 10) & 0x1F) << 3
-        r_img = Image.fromarray(r.astype(np.uint8))
-        g_img = Image.fromarray(g.astype(np.uint8))
-        b_img = Image.fromarray(b.astype(np.uint8))
-        return Image.merge("RGB", [r_img, g_img, b_img])
+    return Image.fromarray(_RGB555_LUT[color_vals], mode="RGB")
 
 
 def image_to_tim(image: Image.Image, bpp=8):
@@ -156,14 +227,11 @@ def image_to_tim(image: Image.Image, bpp=8):
 
     if bpp == 4:
         w_words = (width + 3) // 4
-        flat_pixels = pixels.flatten()
-        flat_pixels = np.clip(flat_pixels, 0, 15)
-        packed = bytearray()
-        for i in range(0, len(flat_pixels), 2):
-            first = int(flat_pixels[i])
-            second = int(flat_pixels[i+1]) if i+1 < len(flat_pixels) else 0
-            packed.append((second << 4) | first)
-        pixel_bytes = bytes(packed)
+        flat_pixels = np.clip(pixels.ravel(), 0, 15).astype(np.uint8)
+        if flat_pixels.size % 2:
+            flat_pixels = np.concatenate([flat_pixels, np.zeros(1, dtype=np.uint8)])
+        packed = (flat_pixels[0::2] | (flat_pixels[1::2] << 4)).astype(np.uint8)
+        pixel_bytes = packed.tobytes()
     else:
         w_words = (width + 1) // 2
         pixel_bytes = pixels.tobytes()
@@ -175,6 +243,33 @@ def image_to_tim(image: Image.Image, bpp=8):
 
     return header
 
+def _convert_one(task):
+    """Convert a single file for batch_convert. Module-level so it can run
+    in a worker process; only paths and flags cross the process boundary."""
+    path, ftype, palette_index, folder, to_png, to_bmp, to_tim = task
+    base = os.path.splitext(os.path.basename(path))[0]
+    count = 0
+    try:
+        if ftype == 'tim':
+            if to_png or to_bmp:
+                img = read_tim(path, palette_index)
+                if to_png:
+                    img.save(os.path.join(folder, base + ".png"))
+                    count += 1
+                if to_bmp:
+                    img.save(os.path.join(folder, base + ".bmp"))
+                    count += 1
+        else:
+            if to_tim:
+                img = Image.open(path).convert('P', palette=Image.ADAPTIVE, colors=16)
+                tim_bytes = image_to_tim(img, bpp=4)
+                with open(os.path.join(folder, base + ".tim"), "wb") as f:
+                    f.write(tim_bytes)
+                count += 1
+    except Exception as e:
+        print("Batch conversion error:", path, e)
+    return count
+
 # ---------- UI Application ----------
 class TIMViewerApp:
     def __init__(self, root):
@@ -186,10 +281,18 @@ class TIMViewerApp:
 
         self.tim_files = []
         self.file_types = []
+        self.header_cache = {}
         self.palettes = []
         self.palette_indices = []
         self.bpp_modes = []
-        self.thumb_cache = {}
+        self.thumb_cache = collections.OrderedDict()
+        self._img_cache = collections.OrderedDict()
+        self._thumb_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 2)
+        self._thumb_labels = {}
+        self._thumb_generation = 0
+        self._view_center = (0.5, 0.5)
+        self._preview_photo = None
+        self._preview_photo_mode = None
         self.index = 0
 
         self.zoom_level_var.set(4)
@@ -245,6 +348,10 @@ class TIMViewerApp:
 
         ttk.Button(toolbar, text="Refresh Thumbs", command=self._refresh_thumbs).pack(side="left", padx=8)
 
+        self.hq_thumbs = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="HQ Thumbs", variable=self.hq_thumbs,
+                        command=self._refresh_thumbs).pack(side="left", padx=4)
+
         ttk.Label(toolbar, text=" ").pack(side="left", expand=True)
 
         self.thumbnail_mode = tk.BooleanVar(value=True)
@@ -366,6 +473,7 @@ class TIMViewerApp:
         self.palettes.pop(idx)
         self.palette_indices.pop(idx)
         self.bpp_modes.pop(idx)
+        self.header_cache.pop(removed, None)
         self._remove_thumb(removed)
         self._refresh_file_list()
         self.index = max(0, idx-1)
@@ -430,41 +538,28 @@ class TIMViewerApp:
             if not os.path.isfile(path):
                 continue
             ext = os.path.splitext(path)[1].lower()
+            bpp = 24
+            palettes_count = 1
             if ext == '.tim':
+                # One open covers the magic check and the cached header parse.
                 try:
-                    with open(path, "rb") as f:
-                        if struct.unpack("<I", f.read(4))[0] != 0x10:
-                            continue
+                    hdr = self._parse_tim_header(path)
                 except Exception:
                     continue
+                if hdr['magic'] != 0x10:
+                    continue
                 self.tim_files.append(path)
                 self.file_types.append('tim')
+                self.header_cache[path] = hdr
+                bpp = hdr['bpp']
+                if hdr['has_clut'] and hdr['clut_h'] > 0:
+                    palettes_count = hdr['clut_h']
             elif ext in ('.png', '.bmp', '.jpg', '.jpeg'):
                 self.tim_files.append(path)
                 self.file_types.append(ext[1:])
             else:
                 continue
 
-            idx = len(self.tim_files) - 1
-            bpp = 24
-            palettes_count = 1
-            try:
-                if self.file_types[idx] == 'tim':
-                    with open(self.tim_files[idx], 'rb') as f:
-                        f.seek(4)
-                        flags = struct.unpack("<I", f.read(4))[0]
-                        has_clut = flags & 0x08
-                        bpp_mode = flags & 0x07
-                        bpp = {0:4,1:8,2:16,3:24}.get(bpp_mode, 24)
-                        if has_clut:
-                            f.seek(12)
-                            clut_sz = struct.unpack("<I", f.read(4))[0]
-                            cx, cy, cw, ch = struct.unpack("<4H", f.read(8))
-                            palettes_count = ch if ch > 0 else 1
-            except Exception:
-                palettes_count = 1
-                bpp = 24
-
             self.palettes.append(palettes_count)
             self.palette_indices.append(0)
             self.bpp_modes.append(bpp)
@@ -479,9 +574,35 @@ class TIMViewerApp:
             self.display_image()
             self._update_palette_preview()
 
+    def _parse_tim_header(self, path):
+        """Parse magic/flags/CLUT once so selection changes never hit disk.
+        CLUT rows are small, so the raw colors are kept in the cache too."""
+        with open(path, 'rb') as f:
+            magic, flags = struct.unpack("<2I", f.read(8))
+            hdr = {
+                'magic': magic,
+                'flags': flags,
+                'has_clut': bool(flags & 0x08),
+                'bpp_mode': flags & 0x07,
+                'bpp': {0: 4, 1: 8, 2: 16, 3: 24}.get(flags & 0x07, 24),
+                'clut_w': 0,
+                'clut_h': 0,
+                'clut_colors': None,
+            }
+            if hdr['has_clut']:
+                clut_block_size = struct.unpack("<I", f.read(4))[0]
+                cx, cy, cw, ch = struct.unpack("<4H", f.read(8))
+                hdr['clut_w'] = cw
+                hdr['clut_h'] = ch
+                hdr['clut_colors'] = np.frombuffer(f.read(clut_block_size - 12), dtype=np.uint16)
+        return hdr
+
     def _populate_thumbnails(self):
         for child in self.thumb_inner.winfo_children():
             child.destroy()
+        self._thumb_generation += 1
+        gen = self._thumb_generation
+        self._thumb_labels = {}
 
         cols = 3
         thumb_size = 120
@@ -494,9 +615,16 @@ class TIMViewerApp:
             frame.grid(row=cur_row, column=cur_col, padx=pad, pady=pad)
             frame.grid_propagate(False)
 
-            tkimg = self._get_thumbnail_for(path, thumb_size - 4)
-            lbl = tk.Label(frame, image=tkimg, bg=self._colors['panel'])
-            lbl.image = tkimg
+            if path in self.thumb_cache:
+                self.thumb_cache.move_to_end(path)
+                tkimg = self.thumb_cache[path]
+                lbl = tk.Label(frame, image=tkimg, bg=self._colors['panel'])
+                lbl.image = tkimg
+            else:
+                lbl = tk.Label(frame, text="...", bg=self._colors['panel'], fg=self._colors['fg'])
+                if path not in self._thumb_labels:
+                    self._thumb_labels[path] = lbl
+                    self._submit_thumb_job(gen, path, self.file_types[i], thumb_size - 4)
             lbl.pack(expand=True)
             lbl.bind("<Button-1>", lambda e, idx=i: self._on_thumb_click(idx))
             lbl.bind("<Button-3>", lambda e, idx=i: self._on_thumb_right_click(e, idx))
@@ -510,6 +638,36 @@ class TIMViewerApp:
                 cur_col = 0
                 cur_row += 1
 
+    def _submit_thumb_job(self, gen, path, ftype, size):
+        # Decode happens off the Tk thread; the preloaded image (if any) is
+        # looked up here so workers never touch self._img_cache.
+        preloaded = self._cached_full_image(path)
+        future = self._thumb_executor.submit(self._build_thumb_image, path, ftype, size,
+                                             preloaded, self.hq_thumbs.get())
+
+        def _done(fut):
+            try:
+                img = fut.result()
+            except Exception:
+                return
+            try:
+                self.root.after(0, self._apply_thumb, gen, path, img)
+            except Exception:
+                pass  # window already destroyed
+
+        future.add_done_callback(_done)
+
+    def _apply_thumb(self, gen, path, img):
+        # Runs on the Tk main thread: PhotoImage must not be built in workers.
+        if gen != self._thumb_generation:
+            return
+        tkimg = ImageTk.PhotoImage(img)
+        self._cache_thumb(path, tkimg)
+        lbl = self._thumb_labels.get(path)
+        if lbl is not None and lbl.winfo_exists():
+            lbl.config(image=tkimg, text="")
+            lbl.image = tkimg
+
     def _on_thumb_click(self, idx):
         self.index = idx
         self.file_listbox.selection_clear(0, tk.END)
@@ -528,24 +686,67 @@ class TIMViewerApp:
         finally:
             self.context_menu.grab_release()
 
-    def _get_thumbnail_for(self, path, size=100):
-        if path in self.thumb_cache:
-            return self.thumb_cache[path]
+    def _thumb_cache_path(self, path, size, hq=False):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        digest = hashlib.blake2b(f"{path}|{mtime}|{size}|{int(hq)}".encode("utf-8"), digest_size=16).hexdigest()
+        try:
+            os.makedirs(_THUMB_CACHE_DIR, exist_ok=True)
+        except OSError:
+            return None
+        return os.path.join(_THUMB_CACHE_DIR, digest + ".png")
 
+    def _cached_full_image(self, path):
         try:
-            if self.file_types[self.tim_files.index(path)] == 'tim':
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        return self._img_cache.get((path, 0, mtime))
+
+    def _build_thumb_image(self, path, ftype, size, img=None, hq=False):
+        """Produce the composited thumbnail as a PIL image. Safe to call from
+        a worker thread: no Tk objects and no shared caches are touched (the
+        hq flag is captured by the caller on the main thread)."""
+        cache_path = self._thumb_cache_path(path, size, hq)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                cached = Image.open(cache_path)
+                cached.load()
+                return cached
+            except Exception:
+                pass
+        try:
+            if img is not None:
+                img = img.copy()
+            elif ftype == 'tim':
                 img = read_tim(path, 0)
             else:
-                img = Image.open(path).convert("RGBA")
+                img = Image.open(path)
+                img.draft("RGB", (size * 2, size * 2))
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    # only pay for RGBA when the source can carry alpha
+                    img = img.convert("RGBA")
         except Exception:
             img = Image.new("RGBA", (size, size), (60,60,60,255))
-        img.thumbnail((size, size), Image.LANCZOS)
-        bg = Image.new("RGBA", (size, size), (34,34,34,255))
+        img.thumbnail((size, size), Image.LANCZOS if hq else Image.BILINEAR)
+        use_alpha = img.mode == 'RGBA'
+        bg = Image.new("RGBA" if use_alpha else "RGB", (size, size), (34,34,34,255) if use_alpha else (34,34,34))
         w,h = img.size
-        bg.paste(img, ((size-w)//2, (size-h)//2), img if img.mode == 'RGBA' else None)
-        tkimg = ImageTk.PhotoImage(bg)
+        bg.paste(img, ((size-w)//2, (size-h)//2), img if use_alpha else None)
+        if cache_path:
+            try:
+                bg.save(cache_path, "PNG", optimize=False)
+            except Exception:
+                pass
+        return bg
+
+    def _cache_thumb(self, path, tkimg):
         self.thumb_cache[path] = tkimg
-        return tkimg
+        self.thumb_cache.move_to_end(path)
+        while len(self.thumb_cache) > 512:
+            self.thumb_cache.popitem(last=False)
 
     def _remove_thumb(self, path):
         if path in self.thumb_cache:
@@ -592,35 +793,28 @@ class TIMViewerApp:
             return
         path = self.tim_files[idx]
         try:
-            with open(path, 'rb') as f:
-                f.seek(4)
-                flags = struct.unpack("<I", f.read(4))[0]
-                has_clut = flags & 0x08
-                if not has_clut:
-                    return
-                f.seek(12)
-                clut_block_size = struct.unpack("<I", f.read(4))[0]
-                cx, cy, cw, ch = struct.unpack("<4H", f.read(8))
-                clut_data = f.read(clut_block_size - 12)
-                clut_colors = np.frombuffer(clut_data, dtype=np.uint16)
-                if cw == 0:
-                    return
-                rows = ch
-                cols = cw
-                sel_row = self.palette_indices[idx] if idx < len(self.palette_indices) else 0
-                start = sel_row * cols
-                end = start + cols
-                row_colors = clut_colors[start:end]
-                w = self.palette_preview_canvas.winfo_width() or 400
-                h = self.palette_preview_canvas.winfo_height() or 60
-                box_w = max(8, w // max(1, len(row_colors)))
-                for i, c in enumerate(row_colors):
-                    r = (c & 0x1F) << 3
-                    g = ((c >> 5) & 0x1F) << 3
-                    b = ((c >> 10) & 0x1F) << 3
-                    x0 = i * box_w
-                    x1 = x0 + box_w
-                    self.palette_preview_canvas.create_rectangle(x0, 0, x1, h, fill=_rgb_to_hex((r,g,b)), outline="")
+            hdr = self.header_cache.get(path)
+            if hdr is None or not hdr['has_clut']:
+                return
+            clut_colors = hdr['clut_colors']
+            cols = hdr['clut_w']
+            if cols == 0:
+                return
+            sel_row = self.palette_indices[idx] if idx < len(self.palette_indices) else 0
+            start = sel_row * cols
+            end = start + cols
+            row_colors = np.asarray(clut_colors[start:end], dtype=np.uint16)
+            w = self.palette_preview_canvas.winfo_width() or 400
+            h = self.palette_preview_canvas.winfo_height() or 60
+            box_w = max(8, w // max(1, len(row_colors)))
+            r = ((row_colors & 0x1F) << 3).astype(np.uint32)
+            g = (((row_colors >> 5) & 0x1F) << 3).astype(np.uint32)
+            b = (((row_colors >> 10) & 0x1F) << 3).astype(np.uint32)
+            hex_colors = [f"#{v:06x}" for v in (r << 16) | (g << 8) | b]
+            for i, color in enumerate(hex_colors):
+                x0 = i * box_w
+                x1 = x0 + box_w
+                self.palette_preview_canvas.create_rectangle(x0, 0, x1, h, fill=color, outline="")
         except Exception:
             pass
 
@@ -632,25 +826,20 @@ class TIMViewerApp:
             return
         path = self.tim_files[idx]
         try:
-            with open(path, 'rb') as f:
-                f.seek(4)
-                flags = struct.unpack("<I", f.read(4))[0]
-                has_clut = flags & 0x08
-                if not has_clut:
-                    return
-                f.seek(12)
-                clut_block_size = struct.unpack("<I", f.read(4))[0]
-                cx, cy, cw, ch = struct.unpack("<4H", f.read(8))
-                if cw <= 0:
-                    return
-                w = self.palette_preview_canvas.winfo_width() or 400
-                box_w = w / cw
-                clicked_col = int(event.x // box_w)
-                new_index = clicked_col
-                new_index = max(0, min(new_index, cw-1))
-                self.palette_indices[idx] = new_index
-                self.display_image()
-                self._update_palette_preview()
+            hdr = self.header_cache.get(path)
+            if hdr is None or not hdr['has_clut']:
+                return
+            cw = hdr['clut_w']
+            if cw <= 0:
+                return
+            w = self.palette_preview_canvas.winfo_width() or 400
+            box_w = w / cw
+            clicked_col = int(event.x // box_w)
+            new_index = clicked_col
+            new_index = max(0, min(new_index, cw-1))
+            self.palette_indices[idx] = new_index
+            self.display_image()
+            self._update_palette_preview()
         except Exception:
             pass
 
@@ -663,21 +852,16 @@ class TIMViewerApp:
             return
         path = self.tim_files[self.index]
         try:
-            with open(path, 'rb') as f:
-                data = f.read(64)
             out = []
-            try:
-                magic = struct.unpack_from("<I", data, 0)[0]
-                out.append(f"Magic: 0x{magic:08X}")
-                flags = struct.unpack_from("<I", data, 4)[0]
-                out.append(f"Flags: 0x{flags:08X}")
-                has_clut = bool(flags & 0x08)
-                bpp_mode = flags & 0x07
-                out.append(f"Has CLUT: {has_clut}")
+            hdr = self.header_cache.get(path)
+            if hdr is not None:
+                out.append(f"Magic: 0x{hdr['magic']:08X}")
+                out.append(f"Flags: 0x{hdr['flags']:08X}")
+                out.append(f"Has CLUT: {hdr['has_clut']}")
                 # fixed f-string usage by precomputing lookup
                 bpp_names = {0: '4bpp', 1: '8bpp', 2: '16bpp', 3: '24bpp'}
-                out.append(f"BPP mode: {bpp_mode} ({bpp_names.get(bpp_mode, '?')})")
-            except Exception:
+                out.append(f"BPP mode: {hdr['bpp_mode']} ({bpp_names.get(hdr['bpp_mode'], '?')})")
+            else:
                 out.append("Not a TIM or header too short")
             out.append(f"Path: {path}")
             try:
@@ -689,6 +873,47 @@ class TIMViewerApp:
             self.inspector_text.insert("1.0", f"Error reading file: {e}\n{traceback.format_exc()}")
         self.inspector_text.configure(state="disabled")
 
+    def _load_full_image(self, path, ftype, palette_index=0):
+        """Decode a file to a PIL image, with a small LRU cache so palette
+        clicks, zooming and re-selection do not re-read from disk."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        key = (path, palette_index, mtime)
+        if key in self._img_cache:
+            self._img_cache.move_to_end(key)
+            return self._img_cache[key]
+        if ftype == 'tim':
+            img = read_tim(path, palette_index)
+        else:
+            img = Image.open(path).convert("RGBA")
+        self._img_cache[key] = img
+        while len(self._img_cache) > 32:
+            self._img_cache.popitem(last=False)
+        return img
+
+    def _zoom_for_viewport(self, img, zoom):
+        """Upscale only the part of the source that fits the preview area.
+
+        At high zoom the full NEAREST upscale allocates a zoom^2-sized buffer
+        even though most of it is offscreen; cropping to the visible region
+        first keeps the resize proportional to the viewport.
+        """
+        w, h = img.size
+        vis_w = self.preview_label.winfo_width()
+        vis_h = self.preview_label.winfo_height()
+        if vis_w <= 1 or vis_h <= 1 or (w * zoom <= vis_w and h * zoom <= vis_h):
+            return img.resize((w * zoom, h * zoom), Image.NEAREST)
+
+        src_w = min(w, -(-vis_w // zoom))
+        src_h = min(h, -(-vis_h // zoom))
+        cx, cy = self._view_center
+        left = max(0, min(w - src_w, int(cx * w - src_w / 2)))
+        top = max(0, min(h - src_h, int(cy * h - src_h / 2)))
+        crop = img.crop((left, top, left + src_w, top + src_h))
+        return crop.resize((src_w * zoom, src_h * zoom), Image.NEAREST)
+
     def display_image(self):
         if not self.tim_files:
             self.preview_label.config(image="", text="No image")
@@ -697,10 +922,7 @@ class TIMViewerApp:
         path = self.tim_files[self.index]
         ftype = self.file_types[self.index]
         try:
-            if ftype == 'tim':
-                img = read_tim(path, self.palette_indices[self.index])
-            else:
-                img = Image.open(path).convert("RGBA")
+            img = self._load_full_image(path, ftype, self.palette_indices[self.index])
         except Exception as e:
             self.preview_label.config(text=f"Failed to load: {e}", image="")
             self.status_label.config(text=f"Failed to load {os.path.basename(path)}")
@@ -708,12 +930,23 @@ class TIMViewerApp:
 
         zoom = max(1, int(self.zoom_level_var.get()))
         w,h = img.size
-        zoomed = img.resize((w*zoom, h*zoom), Image.NEAREST)
+        zoomed = self._zoom_for_viewport(img, zoom)
         if zoomed.mode not in ("RGB","RGBA"):
             zoomed = zoomed.convert("RGBA")
-        tkimg = ImageTk.PhotoImage(zoomed)
-        self.preview_label.image = tkimg
-        self.preview_label.config(image=tkimg, text="")
+        # Paste into the existing PhotoImage when the geometry matches: Tk
+        # image allocation and handle churn are the expensive part of a zoom
+        # tick. The mode must match too — pasting RGBA into an RGB photo
+        # silently drops the alpha channel.
+        photo = self._preview_photo
+        if (photo is None or (photo.width(), photo.height()) != zoomed.size
+                or self._preview_photo_mode != zoomed.mode):
+            photo = ImageTk.PhotoImage(zoomed)
+            self._preview_photo = photo
+            self._preview_photo_mode = zoomed.mode
+        else:
+            photo.paste(zoomed)
+        self.preview_label.image = photo
+        self.preview_label.config(image=photo, text="")
         self.status_label.config(text=f"{os.path.basename(path)}  —  {img.size[0]}x{img.size[1]} @ {zoom}x")
         self._update_inspector()
         self._update_palette_preview()
@@ -763,57 +996,22 @@ class TIMViewerApp:
         self.root.wait_window(opts.top)
         if not opts.confirmed:
             return
-        convert_tim_to_png = opts.to_png
-        convert_tim_to_bmp = opts.to_bmp
-        convert_to_tim = opts.to_tim
-
-        count = 0
-        for i, path in enumerate(self.tim_files):
-            ft = self.file_types[i]
-            base = os.path.splitext(os.path.basename(path))[0]
-            try:
-                if ft == 'tim':
-                    img = read_tim(path, self.palette_indices[i])
-                    if convert_tim_to_png:
-                        img.save(os.path.join(folder, base + ".png"))
-                        count += 1
-                    if convert_tim_to_bmp:
-                        img.save(os.path.join(folder, base + ".bmp"))
-                        count += 1
-                else:
-                    if convert_to_tim:
-                        img = Image.open(path).convert('P', palette=Image.ADAPTIVE, colors=16)
-                        tim_bytes = image_to_tim(img, bpp=4)
-                        with open(os.path.join(folder, base + ".tim"), "wb") as f:
-                            f.write(tim_bytes)
-                        count += 1
-            except Exception as e:
-                print("Batch conversion error:", path, e)
+        # Snapshot the Tk vars here: the task tuples get pickled into the
+        # worker processes, and a BooleanVar is neither picklable nor falsy.
+        convert_tim_to_png = opts.to_png.get()
+        convert_tim_to_bmp = opts.to_bmp.get()
+        convert_to_tim = opts.to_tim.get()
+
+        tasks = [(path, self.file_types[i], self.palette_indices[i], folder,
+                  convert_tim_to_png, convert_tim_to_bmp, convert_to_tim)
+                 for i, path in enumerate(self.tim_files)]
+        with ProcessPoolExecutor() as ex:
+            count = sum(ex.map(_convert_one, tasks))
 
         messagebox.showinfo("Batch Convert", f"Done — {count} files saved to: {folder}")
 
     def _on_dnd(self, event):
-        data = event.data
-        paths = []
-        cur = ""
-        in_brace = False
-        for ch in data:
-            if ch == '{':
-                in_brace = True
-                cur = ""
-            elif ch == '}':
-                in_brace = False
-                if cur:
-                    paths.append(cur)
-                cur = ""
-            elif ch == ' ' and not in_brace:
-                if cur:
-                    paths.append(cur)
-                cur = ""
-            else:
-                cur += ch
-        if cur:
-            paths.append(cur)
+        paths = [a or b for a, b in _DND_RE.findall(event.data)]
         self._add_paths(paths)
 
 class BatchConvertDialog:
@@ -844,9 +1042,6 @@ class BatchConvertDialog:
         self.confirmed = False
         self.top.destroy()
 
-def _rgb_to_hex(rgb_tuple):
-    return "#%02x%02x%02x" % tuple(int(max(0,min(255,v))) for v in rgb_tuple[:3])
-
 def main():
     if DND_AVAILABLE:
         try:
@@ -860,4 +1055,7 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Required for the PyInstaller build: without it the batch-convert
+    # worker processes re-run the whole program and open new windows.
+    multiprocessing.freeze_support()
     main()
@@ -1,6 +1,9 @@
 import os
 import struct
+import mmap
+import collections
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
 import numpy as np
@@ -9,6 +12,16 @@ import numpy as np
 #### WORK IN PROGRESS ####
 ##########################
 
+# BGR555 -> RGB888 lookup, built once at import: one gather per pixel (or
+# palette entry) replaces the shift/mask chain. Top bits are replicated into
+# the low bits so 0x1F expands to 255.
+_idx = np.arange(65536, dtype=np.uint16)
+_RGB555_LUT = np.empty((65536, 3), dtype=np.uint8)
+for _c, _shift in ((0, 0), (1, 5), (2, 10)):
+    _v = ((_idx >> _shift) & 0x1F).astype(np.uint8)
+    _RGB555_LUT[:, _c] = (_v << 3) | (_v >> 2)
+del _idx, _c, _shift, _v
+
 def read_tim(filepath, palette_index=0):
     with open(filepath, 'rb') as f:
         if struct.unpack("<I", f.read(4))[0] != 0x10:
@@ -45,44 +58,63 @@ def read_tim(filepath, palette_index=0):
             w = w_words * 2
         else:
             w = w_words
-        raw_data = f.read()
+        # Map the pixel payload instead of copying it into a bytes object;
+        # np.frombuffer then reads straight from the page cache. Every decode
+        # branch copies into its output image, and the map is released when
+        # the views go out of scope on return. Falls back to read() where
+        # mapping is not possible (e.g. empty or special files).
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            raw_data = memoryview(mm)[f.tell():]
+        except (ValueError, OSError):
+            raw_data = f.read()
 
         if bpp == 4:
             num_pixels = w * h
             bytes_needed = (num_pixels + 1) // 2
-            pixels = np.frombuffer(raw_data[:bytes_needed], dtype=np.uint8)
-            pixels_unpack = np.zeros(num_pixels, dtype=np.uint8)
-            for i in range(num_pixels):
-                byte = pixels[i // 2]
-                pixels_unpack[i] = byte & 0x0F if i % 2 == 0 else (byte >> 4) & 0x0F
-            pixels = pixels_unpack.reshape((h, w))
-            color_vals = selected_palette[pixels]
+            packed = np.frombuffer(raw_data[:bytes_needed], dtype=np.uint8)
+            try:
+                # Pillow's P;4 raw decoder unpacks nibbles in C, but expects
+                # the first pixel in the high nibble; TIM stores it in the
+                # low nibble, so swap each byte once in numpy first.
+                swapped = ((packed << 4) | (packed >> 4)).astype(np.uint8)
+                pimg = Image.frombytes("P", (w, h), swapped.tobytes(), "raw", "P;4")
+            except ValueError:
+                lo = packed & 0x0F
+                hi = (packed >> 4) & 0x0F
+                pixels_unpack = np.empty(len(packed) * 2, dtype=np.uint8)
+                pixels_unpack[0::2] = lo
+                pixels_unpack[1::2] = hi
+                pimg = Image.fromarray(pixels_unpack[:num_pixels].reshape((h, w)), mode='P')
 
         elif bpp == 8:
             pixels = np.frombuffer(raw_data[:w * h], dtype=np.uint8).reshape((h, w))
-            color_vals = selected_palette[pixels]
+            pimg = Image.fromarray(pixels, mode='P')
 
         elif bpp == 16:
+            # Note: Pillow's "BGR;15" raw decoder looks like a drop-in here,
+            # but it takes red from bits 10-14 whereas PSX words keep red in
+            # bits 0-4, so it would swap R/B (a byteswap can't fix a bit-field
+            # mismatch). The LUT gather below is the native-speed path.
             img_array = np.frombuffer(raw_data, dtype=np.uint16).reshape((h, w))
-            r = (img_array & 0x1F) << 3
-            g = ((img_array >> 5) & 0x1F) << 3
-            b = ((img_array >> 10) & 0x1F) << 3
-            return Image.merge("RGB", [Image.fromarray(r.astype(np.uint8)),
-                                       Image.fromarray(g.astype(np.uint8)),
-                                       Image.fromarray(b.astype(np.uint8))])
+            # the LUT gather yields one C-contiguous HxWx3 buffer, which is
+            # what fromarray wants; ascontiguousarray guards against any
+            # future slicing upstream making it strided
+            return Image.fromarray(np.ascontiguousarray(_RGB555_LUT[img_array]), "RGB")
 
         elif bpp == 24:
-            return Image.frombytes("RGB", (w, h), raw_data[:w * h * 3], "raw", "RGB")
+            arr = np.frombuffer(raw_data, dtype=np.uint8, count=w * h * 3).reshape(h, w, 3)
+            return Image.fromarray(arr, 'RGB')
 
         else:
             raise NotImplementedError("Unsupported BPP")
 
-        r = (color_vals & 0x1F) << 3
-        g = ((color_vals >> 5) & 0x1F) << 3
-        b = ((color_vals >> 10) & 0x1F) << 3
-        return Image.merge("RGB", [Image.fromarray(r.astype(np.uint8)),
-                                   Image.fromarray(g.astype(np.uint8)),
-                                   Image.fromarray(b.astype(np.uint8))])
+        # Indexed modes: expand the <=256-entry palette once and let PIL's
+        # P->RGB convert do the per-pixel lookup, instead of gathering a
+        # full-size uint16 image through the CLUT.
+        pal = np.asarray(selected_palette, dtype=np.uint16)
+        pimg.putpalette(_RGB555_LUT[pal].tobytes())
+        return pimg.convert('RGB')
 
 
 def image_to_tim(image: Image.Image, bpp=8):
@@ -100,20 +132,19 @@ def image_to_tim(image: Image.Image, bpp=8):
 
 
 
-    clut_colors = []
-    for i in range(0, len(palette), 3):
-        r = palette[i] >> 3
-        g = palette[i+1] >> 3
-        b = palette[i+2] >> 3
-        color_16 = (b << 10) | (g << 5) | r
-        clut_colors.append(color_16)
-
-    unique_colors = np.unique(pixels)
-    clut_array = np.array([clut_colors[c] for c in unique_colors], dtype=np.uint16)
+    pal = np.frombuffer(bytes(palette), dtype=np.uint8).reshape(-1, 3)
+    r = (pal[:, 0] >> 3).astype(np.uint16)
+    g = (pal[:, 1] >> 3).astype(np.uint16)
+    b = (pal[:, 2] >> 3).astype(np.uint16)
+    clut_colors = (b << 10) | (g << 5) | r
 
-
-    clut_array = np.array(clut_colors[:16 if bpp == 4 else 256], dtype=np.uint16)
+    # PIL adaptive palettes can come back with fewer entries than the CLUT
+    # width we write in the header; pad with zeros to exactly 16/256 so the
+    # block is never silently short.
     clut_w = 16 if bpp == 4 else 256
+    clut_array = np.zeros(clut_w, dtype=np.uint16)
+    n = min(clut_w, len(clut_colors))
+    clut_array[:n] = clut_colors[:n]
     clut_h = 1
 
 
@@ -154,14 +185,13 @@ def image_to_tim(image: Image.Image, bpp=8):
 
 
     if bpp == 4:
-        flat_pixels = pixels.flatten()
-        flat_pixels = np.clip(flat_pixels, 0, 15)
-        packed_pixels = bytearray()
-        for i in range(0, len(flat_pixels), 2):
-            first = flat_pixels[i]
-            second = flat_pixels[i+1] if i+1 < len(flat_pixels) else 0
-            packed_pixels.append((second << 4) | first)
-        pixel_bytes = bytes(packed_pixels)
+        flat_pixels = np.clip(pixels.ravel(), 0, 15).astype(np.uint8)
+        if flat_pixels.size & 1:
+            flat_pixels = np.append(flat_pixels, np.uint8(0))
+        # view adjacent nibble pairs as rows so each OR reads one contiguous
+        # 16-bit word instead of two strided passes (first = low nibble)
+        pairs = flat_pixels.reshape(-1, 2)
+        pixel_bytes = ((pairs[:, 1] << 4) | pairs[:, 0]).astype(np.uint8).tobytes()
     else:
 
         pixel_bytes = pixels.tobytes()
@@ -181,12 +211,15 @@ class TIMViewer(tk.Tk):
 
         self.tim_files = []
         self.images = []
-        self.tk_images_cache = []
         self.palettes = []
         self.palette_indices = []
         self.zoom_levels = []
         self.bpp_modes = []
         self.file_types = []
+        self._decoded_cache = collections.OrderedDict()
+        self._photo = None
+        self._photo_mode = None
+        self._zoom_after_id = None
 
         self.index = 0
 
@@ -213,7 +246,7 @@ class TIMViewer(tk.Tk):
         tk.Label(zoom_frame, text="Zoom:").pack(side=tk.LEFT)
         self.zoom_level = tk.IntVar(value=4)
         self.zoom_slider = tk.Scale(zoom_frame, from_=1, to=8, orient=tk.HORIZONTAL,
-                                    variable=self.zoom_level, command=lambda e: self.display_image())
+                                    variable=self.zoom_level, command=self._on_zoom_change)
         self.zoom_slider.pack(side=tk.LEFT)
 
         palette_frame = tk.Frame(self)
@@ -254,69 +287,54 @@ class TIMViewer(tk.Tk):
         all_files = [os.path.join(folder, f) for f in os.listdir(folder)]
         self.tim_files.clear()
         self.images.clear()
-        self.tk_images_cache.clear()
         self.palettes.clear()
         self.palette_indices.clear()
         self.zoom_levels.clear()
         self.bpp_modes.clear()
         self.file_types.clear()
+        self._decoded_cache.clear()
 
 
         for path in all_files:
             ext = os.path.splitext(path)[1].lower()
             if ext == '.tim':
-
+                # One open and one ~28-byte read covers the magic check,
+                # flags and CLUT geometry.
                 try:
                     with open(path, "rb") as f:
-                        if struct.unpack("<I", f.read(4))[0] == 0x10:
-                            self.tim_files.append(path)
-                            self.file_types.append('tim')  # <-- NEW
+                        hdr = f.read(28)
+                    magic, flags = struct.unpack_from("<2I", hdr, 0)
                 except Exception:
                     continue
-            elif ext in ['.png', '.bmp']:
-                self.tim_files.append(path)
-                self.file_types.append(ext[1:])  # 'png' or 'bmp'
-
-        if not self.tim_files:
-            messagebox.showinfo("No Valid Files", "No valid TIM, PNG, or BMP files found.")
-            return
+                if magic != 0x10:
+                    continue
 
+                has_clut = flags & 0x08
+                bpp = {0: 4, 1: 8, 2: 16, 3: 24}.get(flags & 0x07, None)
+                palettes_count = 1
+                if has_clut and len(hdr) >= 20:
+                    clut_size, clut_x, clut_y, clut_w, clut_h = struct.unpack_from("<I4H", hdr, 8)
+                    palettes_count = clut_h
 
-        for i, path in enumerate(self.tim_files):
-            ft = self.file_types[i]
-            if ft == 'tim':
-                try:
-                    with open(path, 'rb') as f:
-                        f.seek(4)
-                        flags = struct.unpack("<I", f.read(4))[0]
-                        has_clut = flags & 0x08
-                        bpp_mode = flags & 0x07
-                        bpp = {0: 4, 1: 8, 2: 16, 3: 24}.get(bpp_mode, None)
-
-                        if has_clut:
-                            f.seek(12)
-                            clut_size = struct.unpack("<I", f.read(4))[0]
-                            clut_x, clut_y, clut_w, clut_h = struct.unpack("<4H", f.read(8))
-                            palettes_count = clut_h
-                        else:
-                            palettes_count = 1
-
-                        self.palettes.append(palettes_count)
-                        self.palette_indices.append(0)
-                        self.bpp_modes.append(bpp)
-                        self.zoom_levels.append(4)
-                except Exception as e:
-                    self.palettes.append(1)
-                    self.palette_indices.append(0)
-                    self.bpp_modes.append(4)
-                    self.zoom_levels.append(4)
-            else:
+                self.tim_files.append(path)
+                self.file_types.append('tim')
+                self.palettes.append(palettes_count)
+                self.palette_indices.append(0)
+                self.bpp_modes.append(bpp)
+                self.zoom_levels.append(4)
+            elif ext in ['.png', '.bmp']:
                 # For PNG/BMP, no palettes, bpp = 24
+                self.tim_files.append(path)
+                self.file_types.append(ext[1:])  # 'png' or 'bmp'
                 self.palettes.append(1)
                 self.palette_indices.append(0)
                 self.bpp_modes.append(24)
                 self.zoom_levels.append(4)
 
+        if not self.tim_files:
+            messagebox.showinfo("No Valid Files", "No valid TIM, PNG, or BMP files found.")
+            return
+
         self.index = 0
         self.display_image()
         self.update_palette_combobox()
@@ -340,32 +358,45 @@ class TIMViewer(tk.Tk):
         path = self.tim_files[idx]
         ft = self.file_types[idx]
 
+        # Decode is the expensive part of zoom/palette/navigation events;
+        # keep recently shown images around and only re-decode on a miss.
+        key = (idx, self.palette_indices[idx])
+        if key in self._decoded_cache:
+            self._decoded_cache.move_to_end(key)
+            return self._decoded_cache[key]
+
         if ft == 'tim':
             try:
                 img = read_tim(path, self.palette_indices[idx])
-                return img
             except Exception as e:
                 print(f"Error loading TIM file: {path} {e}")
                 return None
         elif ft in ['png', 'bmp']:
             try:
                 img = Image.open(path).convert("RGBA")
-                return img
             except Exception as e:
                 print(f"Error loading image file: {path} {e}")
                 return None
         else:
             return None
 
+        self._decoded_cache[key] = img
+        while len(self._decoded_cache) > 32:
+            self._decoded_cache.popitem(last=False)
+        return img
+
     def display_image(self):
         img = self.load_image(self.index)
         if img is None:
             self.img_label.config(image='', text="Failed to load image")
             return
 
-        zoom = self.zoom_level.get()
-        w, h = img.size
-        img = img.resize((w * zoom, h * zoom), Image.NEAREST)
+        zoom = int(self.zoom_level.get())
+        if zoom > 1:
+            # integer upscaling is a pure strided copy; numpy repeat beats
+            # PIL's general NEAREST resampler here
+            arr = np.asarray(img)
+            img = Image.fromarray(arr.repeat(zoom, 0).repeat(zoom, 1))
 
         if self.debug_var.get():
             debug_text = f"{self.index + 1}/{len(self.tim_files)} | {os.path.basename(self.tim_files[self.index])} | Zoom: {zoom}x | Palette: {self.palette_indices[self.index]}"
@@ -373,9 +404,29 @@ class TIMViewer(tk.Tk):
         else:
             self.status_label.config(text=os.path.basename(self.tim_files[self.index]))
 
-        tk_img = ImageTk.PhotoImage(img)
-        self.tk_images_cache = [tk_img]  # prevent GC
-        self.img_label.config(image=tk_img)
+        # Reuse one PhotoImage and paste into it; dragging the zoom slider
+        # otherwise allocates and frees a Tk image per tick. Mode changes
+        # (RGB TIM vs RGBA PNG) need a fresh photo — paste would convert
+        # and drop the alpha channel.
+        photo = self._photo
+        if (photo is None or (photo.width(), photo.height()) != img.size
+                or self._photo_mode != img.mode):
+            photo = ImageTk.PhotoImage(img)
+            self._photo = photo
+            self._photo_mode = img.mode
+        else:
+            photo.paste(img)
+        self.img_label.config(image=photo)
+
+    def _on_zoom_change(self, _value=None):
+        # Coalesce the burst of slider callbacks into one redraw.
+        if self._zoom_after_id is not None:
+            self.after_cancel(self._zoom_after_id)
+        self._zoom_after_id = self.after(50, self._zoom_redraw)
+
+    def _zoom_redraw(self):
+        self._zoom_after_id = None
+        self.display_image()
 
     def prev_image(self):
         if not self.tim_files:
@@ -417,29 +468,37 @@ class TIMViewer(tk.Tk):
             save_folder = os.path.join(folder, "Converted to TIM")
             os.makedirs(save_folder, exist_ok=True)
 
-        count = 0
-        for i, path in enumerate(self.tim_files):
+        # Read the Tk vars once on the main thread; workers only see plain bools.
+        to_png = self.convert_png_var.get()
+        to_bmp = self.convert_bmp_var.get()
+        to_tim = self.convert_to_tim_var.get()
+
+        def _convert_one(args):
+            i, path = args
             ft = self.file_types[i]
             filename = os.path.splitext(os.path.basename(path))[0]
+            count = 0
 
             try:
                 if ft == 'tim':
-                    if self.convert_png_var.get():
-                        img = read_tim(path, self.palette_indices[i])
+                    img = read_tim(path, self.palette_indices[i]) if (to_png or to_bmp) else None
+                    if to_png:
                         save_path = os.path.join(save_folder, f"{filename}.png")
                         img.save(save_path)
                         count += 1
-                    if self.convert_bmp_var.get():
-                        img = read_tim(path, self.palette_indices[i])
+                    if to_bmp:
                         save_path = os.path.join(save_folder, f"{filename}.bmp")
                         img.save(save_path)
                         count += 1
                 elif ft in ['png', 'bmp']:
-                    if self.convert_to_tim_var.get():
-                        # Load image and convert to TIM bytes
-                        img = Image.open(path).convert('RGBA')
-                        # Convert to 'P' mode for indexed palette, default 8bpp
-                        img_p = img.convert('P', palette=Image.ADAPTIVE, colors=16)
+                    if to_tim:
+                        # Adaptive quantization handles common modes
+                        # directly; anything else ('1', 'LA', 'I;16', ...)
+                        # still needs the RGBA round-trip first.
+                        src = Image.open(path)
+                        if src.mode not in ('RGB', 'RGBA', 'L', 'P'):
+                            src = src.convert('RGBA')
+                        img_p = src.convert('P', palette=Image.ADAPTIVE, colors=16)
                         tim_bytes = image_to_tim(img_p, bpp=4)
 
                         save_path = os.path.join(save_folder, f"{filename}.tim")
@@ -448,6 +507,10 @@ class TIMViewer(tk.Tk):
                         count += 1
             except Exception as e:
                 print(f"Error converting {path}: {e}")
+            return count
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            count = sum(ex.map(_convert_one, enumerate(self.tim_files)))
 
         messagebox.showinfo("Batch Conversion", f"Conversion complete! {count} files saved.")
 